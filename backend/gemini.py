@@ -1,10 +1,19 @@
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Optional
+from functools import lru_cache
+import hashlib
 import os
+import re
+import threading
 
 import google.generativeai as genai
+import orjson
 from dotenv import load_dotenv
 
+try:
+    import ahocorasick  # pyahocorasick, optional C extension
+except ImportError:
+    ahocorasick = None
+
 
 load_dotenv()
 
@@ -14,11 +23,22 @@ MODEL_ID = os.getenv("GEMINI_MODEL_ID", "gemini-pro")
 if API_KEY:
     genai.configure(api_key=API_KEY)
 
+# Lazily constructed singleton so we don't rebuild SDK state on every request.
+_MODEL: Optional[genai.GenerativeModel] = None
+_MODEL_LOCK = threading.Lock()
+
 
 def _get_model() -> genai.GenerativeModel:
     if not API_KEY:
         raise RuntimeError("GEMINI_API_KEY is not set in environment or .env file")
-    return genai.GenerativeModel(MODEL_ID)
+
+    global _MODEL
+    if _MODEL is None:
+        # Double-checked locking: only the first call pays for construction.
+        with _MODEL_LOCK:
+            if _MODEL is None:
+                _MODEL = genai.GenerativeModel(MODEL_ID)
+    return _MODEL
 
 
 def extract_fields_with_gemini(raw_text: str) -> Dict[str, Any]:
@@ -35,9 +55,33 @@ def extract_fields_with_gemini(raw_text: str) -> Dict[str, Any]:
     }
     """
 
-    model = _get_model()
+    # Repeated uploads of the same document are common in test/demo flows;
+    # cache completed extractions keyed by a hash of the OCR text so those
+    # return without a network round-trip. Failed calls raise inside
+    # _extract_cached and are never cached.
+    text_hash = hashlib.blake2b(raw_text.encode(), digest_size=16).hexdigest()
+    try:
+        data = _extract_cached(text_hash, raw_text)
+    except Exception as exc:
+        # If Gemini call fails (e.g. model ID not supported), return a
+        # structured response instead of raising so the API stays responsive.
+        return {
+            "name": None,
+            "dob": None,
+            "address": None,
+            "phone": None,
+            "email": None,
+            "raw_text": raw_text,
+            "_error": f"Gemini request failed: {exc}",
+        }
+
+    # Copy so callers can't mutate the cached entry.
+    return dict(data)
 
-    prompt = f"""
+
+# The prompt preamble is constant; build it once and concatenate on the hot
+# path instead of re-formatting the whole template per request.
+_PROMPT_PREFIX = """
 You are an information extraction engine for ID cards and forms.
 
 Given the OCR text of a filled document, extract the following fields when present:
@@ -58,44 +102,43 @@ Missing values must be null.
 
 OCR_TEXT:
 
-{raw_text}
 """
 
-    try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
-    except Exception as exc:
-        # If Gemini call fails (e.g. model ID not supported), return a
-        # structured response instead of raising so the API stays responsive.
-        return {
-            "name": None,
-            "dob": None,
-            "address": None,
-            "phone": None,
-            "email": None,
-            "raw_text": raw_text,
-            "_error": f"Gemini request failed: {exc}",
-        }
+# Gemini latency scales with token count and the fields we care about sit on
+# the first page; don't send more OCR text than this.
+_MAX_PROMPT_TEXT = 8000
+
+# Ask Gemini for structured JSON output directly: no code fences to strip,
+# no free-form-text fallback path to maintain.
+_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string", "nullable": True},
+        "dob": {"type": "string", "nullable": True},
+        "address": {"type": "string", "nullable": True},
+        "phone": {"type": "string", "nullable": True},
+        "email": {"type": "string", "nullable": True},
+    },
+    "required": ["name", "dob", "address", "phone", "email"],
+}
+
+_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": _RESPONSE_SCHEMA,
+}
+
+
+@lru_cache(maxsize=512)
+def _extract_cached(text_hash: str, raw_text: str) -> Dict[str, Any]:
+    model = _get_model()
 
-    # Gemini may wrap JSON in code fences; strip them if present
-    if text.startswith("```"):
-        lines = text.splitlines()
-        # remove first and last fence lines
-        if len(lines) >= 3:
-            text = "\n".join(lines[1:-1])
+    prompt = _PROMPT_PREFIX + raw_text[:_MAX_PROMPT_TEXT]
 
-    try:
-        data = json.loads(text)
-    except json.JSONDecodeError:
-        # Fallback: wrap everything in a generic structure
-        data = {
-            "name": None,
-            "dob": None,
-            "address": None,
-            "phone": None,
-            "email": None,
-            "_raw_model_output": text,
-        }
+    # JSON mode guarantees a parseable body; a decode failure propagates to
+    # the caller and becomes a structured _error response like any other
+    # Gemini failure.
+    response = model.generate_content(prompt, generation_config=_GENERATION_CONFIG)
+    data = orjson.loads(response.text)
 
     # Enforce that extracted fields must be substrings of the OCR text
     data = _enforce_substring_constraints(data, raw_text)
@@ -103,19 +146,55 @@ OCR_TEXT:
     return data
 
 
+# Map common whitespace characters to plain spaces with a C-level translate,
+# then collapse runs with a precompiled regex; cheaper than split/join per value.
+_WS_TABLE = str.maketrans({c: " " for c in "\t\n\r\x0b\x0c\xa0"})
+_MULTI_WS = re.compile(r" {2,}")
+
+
+def _normalize(text: str) -> str:
+    return _MULTI_WS.sub(" ", text.lower().translate(_WS_TABLE)).strip()
+
+
+_FIELD_KEYS = ("name", "dob", "address", "phone", "email")
+
+
 def _enforce_substring_constraints(data: Dict[str, Any], raw_text: str) -> Dict[str, Any]:
     """Ensure that each field value appears in the OCR text; otherwise set to None.
 
     This is a strong anti-hallucination guard: if Gemini returns a value that
     cannot be found in the OCR text (ignoring case and extra whitespace), we
     drop it.
+
+    When pyahocorasick is available, all candidate values are matched in a
+    single DFA pass over the OCR text instead of one linear scan per value —
+    the scan cost stays flat as the field set (or a future batch mode) grows.
     """
-    ocr_norm = " ".join(raw_text.lower().split())
+    ocr_norm = _normalize(raw_text)
 
-    for key in ["name", "dob", "address", "phone", "email"]:
+    candidates: Dict[str, str] = {}
+    for key in _FIELD_KEYS:
         val = data.get(key)
         if isinstance(val, str):
-            val_norm = " ".join(val.lower().split())
-            if val_norm and val_norm not in ocr_norm:
-                data[key] = None
+            val_norm = _normalize(val)
+            if val_norm:
+                candidates[key] = val_norm
+
+    if ahocorasick is not None and len(candidates) > 1:
+        automaton = ahocorasick.Automaton()
+        word_keys: Dict[str, list] = {}
+        for key, val_norm in candidates.items():
+            word_keys.setdefault(val_norm, []).append(key)
+        for word, keys in word_keys.items():
+            automaton.add_word(word, keys)
+        automaton.make_automaton()
+        found = set()
+        for _end, keys in automaton.iter(ocr_norm):
+            found.update(keys)
+    else:
+        found = {key for key, val_norm in candidates.items() if val_norm in ocr_norm}
+
+    for key in candidates:
+        if key not in found:
+            data[key] = None
     return data
@@ -1,21 +1,47 @@
-from typing import List, Dict, Any, Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from pathlib import Path
 
-from fastapi import FastAPI, UploadFile, File, HTTPException
+import orjson
+from anyio import to_thread
+from fastapi import FastAPI, Request, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from ocr import extract_text_from_image, extract_text_from_pdf
 from gemini import extract_fields_with_gemini
 from pdf_fill import generate_filled_pdf
 from utils import save_upload_file
-from pydantic import BaseModel
 
-app = FastAPI(title="Smart Form Filler API")
+# orjson serializes responses in C, skipping jsonable_encoder + stdlib json.dumps;
+# this matters most for /process whose payload embeds the full raw_text.
+app = FastAPI(title="Smart Form Filler API", default_response_class=ORJSONResponse)
 
 UPLOADS_DIR = Path(__file__).resolve().parent / "uploads"
 
-app.mount("/uploads", StaticFiles(directory=str(UPLOADS_DIR)), name="uploads")
+# In production behind nginx, set UPLOADS_ACCEL_REDIRECT to the internal
+# location prefix (e.g. "/internal_uploads") so the kernel's sendfile serves
+# the bytes instead of a uvicorn worker. In dev we fall back to StaticFiles.
+UPLOADS_ACCEL_PREFIX = os.getenv("UPLOADS_ACCEL_REDIRECT")
+
+if UPLOADS_ACCEL_PREFIX:
+
+    @app.get("/uploads/{filename}")
+    async def serve_upload(filename: str) -> Response:
+        if filename.startswith(".") or "/" in filename:
+            raise HTTPException(status_code=404, detail="Not found")
+        return Response(
+            headers={"X-Accel-Redirect": f"{UPLOADS_ACCEL_PREFIX}/{filename}"}
+        )
+
+else:
+    app.mount(
+        "/uploads",
+        StaticFiles(directory=str(UPLOADS_DIR), follow_symlink=False),
+        name="uploads",
+    )
 
 # Allow frontend (Next.js) during development
 app.add_middleware(
@@ -30,21 +56,38 @@ app.add_middleware(
 )
 
 
-@app.get("/health")
-async def health() -> dict:
-    return {"status": "ok"}
+def _ocr_dispatch(path: Path) -> str:
+    if path.suffix.lower() == ".pdf":
+        return extract_text_from_pdf(str(path))
+    return extract_text_from_image(str(path))
+
 
+def _ocr_documents(paths: List[Path]) -> str:
+    """OCR every document and join the texts.
 
-class FillRequest(BaseModel):
-    fields: Dict[str, Any]
-    template_pdf_filename: Optional[str] = None
+    Tesseract runs as a subprocess, so pytesseract releases the GIL and a
+    small thread pool gives real parallelism; each Tesseract stays serial via
+    OMP_THREAD_LIMIT=1 in ocr.py.
+    """
+    if len(paths) == 1:
+        return _ocr_dispatch(paths[0])
+    with ThreadPoolExecutor(max_workers=min(4, len(paths))) as executor:
+        texts = list(executor.map(_ocr_dispatch, paths))
+    return "\n\n".join(texts)
+
+
+@app.get("/health")
+async def health() -> ORJSONResponse:
+    return ORJSONResponse({"status": "ok"})
 
 
-@app.post("/process")
+# response_model=None opts out of FastAPI's outgoing validation/encoding pass;
+# the handlers build clean payloads and return Response objects directly.
+@app.post("/process", response_model=None)
 async def process_form(
     form_image: UploadFile = File(...),
     documents: List[UploadFile] = File(default_factory=list),
-) -> dict:
+) -> ORJSONResponse:
     """Main pipeline endpoint: save files, run OCR + Gemini, return JSON + filled PDF path.
 
     For now, this is a stub that wires the modules and returns placeholder results.
@@ -54,63 +97,70 @@ async def process_form(
         base_upload_dir = Path(__file__).resolve().parent / "uploads"
         base_upload_dir.mkdir(parents=True, exist_ok=True)
 
-        form_path = save_upload_file(form_image, base_upload_dir)
-        _doc_paths = [save_upload_file(doc, base_upload_dir / "docs") for doc in documents]
+        # Disk writes are blocking too; run them in worker threads.
+        form_path = await to_thread.run_sync(save_upload_file, form_image, base_upload_dir)
+        _doc_paths = [
+            await to_thread.run_sync(save_upload_file, doc, base_upload_dir / "docs")
+            for doc in documents
+        ]
 
-        # Decide which file to use as OCR source: first supporting document if present,
-        # otherwise fall back to the main form file.
-        if _doc_paths:
-            ocr_source = _doc_paths[0]
-        else:
-            ocr_source = form_path
+        # OCR sources: every supporting document if present, otherwise the
+        # main form file.
+        ocr_sources = _doc_paths if _doc_paths else [form_path]
 
-        # Step 3: we'll implement real Tesseract OCR here
-        if ocr_source.suffix.lower() == ".pdf":
-            raw_text = extract_text_from_pdf(str(ocr_source))
-        else:
-            raw_text = extract_text_from_image(str(ocr_source))
+        # OCR and the Gemini SDK are blocking (Tesseract takes hundreds of ms);
+        # run them in worker threads so concurrent requests don't stall the
+        # event loop. Multiple documents are OCR'd in parallel.
+        raw_text = await to_thread.run_sync(_ocr_documents, ocr_sources)
 
-        # Step 4: we'll implement real Gemini extraction here
-        fields = extract_fields_with_gemini(raw_text)
+        fields = await to_thread.run_sync(extract_fields_with_gemini, raw_text)
 
         # Step 5: for this step we only return extracted fields and template info;
         # PDF generation happens in a separate /fill endpoint after the user reviews/edits.
         template_path = form_path if form_path.suffix.lower() == ".pdf" else None
         template_filename = template_path.name if template_path is not None else None
 
-        return {
+        # Returning a Response directly bypasses jsonable_encoder entirely.
+        return ORJSONResponse({
             "fields": fields,
             "template_pdf_filename": template_filename,
-        }
+        })
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
 
 
-@app.post("/fill")
-async def fill_pdf(request: FillRequest) -> dict:
+@app.post("/fill", response_model=None)
+async def fill_pdf(request: Request) -> ORJSONResponse:
     """Generate a filled PDF from edited fields and an optional template PDF.
 
     If template_pdf_filename is provided and exists, we overlay the fields onto
     that template. Otherwise we fall back to a simple summary PDF.
+
+    The body is parsed with orjson directly; the fields dict carries no
+    structure pydantic could usefully validate, so we skip it on this hot path.
     """
     try:
+        body = orjson.loads(await request.body())
+        fields = body.get("fields", {})
+        template_filename = body.get("template_pdf_filename")
+
         base_upload_dir = Path(__file__).resolve().parent / "uploads"
         base_upload_dir.mkdir(parents=True, exist_ok=True)
 
         template_path: Optional[Path] = None
-        if request.template_pdf_filename:
-            candidate = base_upload_dir / request.template_pdf_filename
+        if template_filename:
+            candidate = base_upload_dir / template_filename
             if candidate.is_file():
                 template_path = candidate
 
         filled_pdf_path = generate_filled_pdf(
-            request.fields,
+            fields,
             base_upload_dir,
             template_path=template_path,
         )
 
-        return {
+        return ORJSONResponse({
             "filled_pdf_filename": Path(filled_pdf_path).name,
-        }
+        })
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc))
@@ -1,31 +1,47 @@
+import os
+from pathlib import Path
 from typing import Optional
-from io import BytesIO
 
-from PIL import Image, ImageOps
+import cv2
+import numpy as np
 import pytesseract
 import fitz  # PyMuPDF
 
+# Tesseract's OpenMP parallelism is inefficient and can be slower than a
+# single thread; keep each invocation serial and scale via concurrent requests.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
 
-def _preprocess_image(image: Image.Image) -> Image.Image:
-    """Simple preprocessing to improve OCR accuracy."""
-    # Convert to grayscale and apply a light threshold to reduce noise
-    gray = ImageOps.grayscale(image)
-    bw = gray.point(lambda x: 0 if x < 160 else 255, "1")
-    return bw
+# LSTM-only engine (skips the legacy path) and no inverted-image retry pass.
+_TESSERACT_CONFIG = "--oem 1 -c tessedit_do_invert=0"
+
+
+def _preprocess_image(gray: np.ndarray) -> np.ndarray:
+    """Binarize a grayscale image to improve OCR accuracy.
+
+    Adaptive thresholding handles uneven lighting much better than a fixed
+    global threshold, and runs at C level instead of a per-pixel Python lambda.
+    """
+    return cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 31, 10
+    )
 
 
 def extract_text_from_image(image_path: str, language: str = "eng", tesseract_cmd: Optional[str] = None) -> str:
-    """Placeholder OCR function.
+    """Extract text from an image file using Tesseract.
 
-    In Step 3 we'll implement real OCR using Tesseract (pytesseract) so that this
-    returns the full text content of the uploaded form and documents.
+    The image is decoded straight to a grayscale NumPy array and binarized
+    with OpenCV before being handed to Tesseract.
     """
     if tesseract_cmd:
         pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
-    image = Image.open(image_path)
-    processed = _preprocess_image(image)
-    text = pytesseract.image_to_string(processed, lang=language)
+    data = Path(image_path).read_bytes()
+    gray = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        raise ValueError(f"Could not decode image: {image_path}")
+
+    processed = _preprocess_image(gray)
+    text = pytesseract.image_to_string(processed, lang=language, config=_TESSERACT_CONFIG)
     return text
 
 
@@ -39,11 +55,21 @@ def extract_text_from_pdf(pdf_path: str, language: str = "eng", tesseract_cmd: O
         return ""
 
     page = doc[0]
-    pix = page.get_pixmap(dpi=200)
-    img_bytes = pix.tobytes("png")
+
+    # Born-digital PDFs already carry a text layer; use it and skip
+    # rasterization + Tesseract entirely. Fall through to OCR only when the
+    # layer is missing or trivially short (e.g. a scanned page).
+    text = page.get_text().strip()
+    if len(text) >= 40:
+        doc.close()
+        return text
+
+    # Render grayscale at 150 dpi — plenty for printed forms — and build the
+    # array straight from the pixmap buffer instead of encoding/decoding PNG.
+    pix = page.get_pixmap(dpi=150, colorspace=fitz.csGRAY)
+    gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
     doc.close()
 
-    image = Image.open(BytesIO(img_bytes))
-    processed = _preprocess_image(image)
-    text = pytesseract.image_to_string(processed, lang=language)
+    processed = _preprocess_image(gray)
+    text = pytesseract.image_to_string(processed, lang=language, config=_TESSERACT_CONFIG)
     return text
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Union, Optional
 
@@ -7,6 +8,47 @@ import fitz  # PyMuPDF
 PathLike = Union[str, Path]
 
 
+@lru_cache(maxsize=32)
+def _template_bytes(path: str, mtime: float) -> bytes:
+    """Read a template PDF once per (path, mtime).
+
+    Users commonly tweak fields and resubmit /fill against the same template;
+    caching the raw bytes lets each request open from memory instead of
+    re-reading disk. The mtime key auto-invalidates when the file changes.
+    """
+    return Path(path).read_bytes()
+
+
+def _find_label_positions(page: "fitz.Page", labels) -> Dict[str, fitz.Rect]:
+    """Locate each label on the page using a single text-layer parse.
+
+    page.search_for re-parses the page per call; extracting the word list once
+    and matching runs of consecutive words in Python is O(labels + words).
+    Returns a mapping of label -> bounding rect of the matched words.
+    """
+    words = page.get_text("words")  # (x0, y0, x1, y1, text, block, line, word)
+
+    positions: Dict[str, fitz.Rect] = {}
+    for label in labels:
+        tokens = label.split()
+        n = len(tokens)
+        for i in range(len(words) - n + 1):
+            run = words[i : i + n]
+            if [w[4] for w in run] != tokens:
+                continue
+            # All tokens must sit on the same line of the same block.
+            if any(w[5:7] != run[0][5:7] for w in run[1:]):
+                continue
+            positions[label] = fitz.Rect(
+                run[0][0],
+                min(w[1] for w in run),
+                run[-1][2],
+                max(w[3] for w in run),
+            )
+            break
+    return positions
+
+
 def generate_filled_pdf(
     fields: Dict,
     output_dir: PathLike,
@@ -23,8 +65,11 @@ def generate_filled_pdf(
     template = Path(template_path) if template_path is not None else None
 
     if template is not None and template.is_file() and template.suffix.lower() == ".pdf":
-        # Use the uploaded PDF as the base template
-        doc = fitz.open(str(template))
+        # Use the uploaded PDF as the base template, parsed from cached bytes
+        doc = fitz.open(
+            stream=_template_bytes(str(template), template.stat().st_mtime),
+            filetype="pdf",
+        )
         page = doc[0]
         pdf_path = out_dir / f"{template.stem}_filled.pdf"
     else:
@@ -51,18 +96,27 @@ def generate_filled_pdf(
             "Date of Birth:": dob,
         }
 
+        positions = _find_label_positions(page, label_map)
+
+        # Accumulate all insertions in a TextWriter and commit once: a single
+        # content-stream write per page instead of one per field, with the
+        # font resolved once instead of per insert_text call.
+        writer = fitz.TextWriter(page.rect, color=(0, 0, 0))
+        font = fitz.Font("helv")
+
         for label, value in label_map.items():
             if not value:
                 continue
-            rects = page.search_for(label)
-            if not rects:
+            rect = positions.get(label)
+            if rect is None:
                 continue
-            rect = rects[0]
             # Place text slightly to the right of the label on the same line.
             x = rect.x1 + 8
             # Use the vertical middle of the label's bounding box.
             y = rect.y0 + (rect.y1 - rect.y0) * 0.7
-            page.insert_text((x, y), str(value), fontsize=10, fill=(0, 0, 0))
+            writer.append((x, y), str(value), font=font, fontsize=10)
+
+        writer.write_text(page)
     else:
         # Summary-only mode when there is no template PDF.
         lines = [
@@ -1,5 +1,5 @@
+import secrets
 import shutil
-import uuid
 from pathlib import Path
 from typing import Optional
 
@@ -15,11 +15,15 @@ def save_upload_file(upload_file: UploadFile, base_dir: Optional[Path] = None) -
 
     original_name = upload_file.filename or "file"
     suffix = Path(original_name).suffix
-    filename = f"{uuid.uuid4().hex}{suffix}"
+    # 8 random bytes is plenty for a unique filename and cheaper than the
+    # full UUID construction path.
+    filename = f"{secrets.token_hex(8)}{suffix}"
 
     dest_path = base_dir / filename
 
     with dest_path.open("wb") as buffer:
-        shutil.copyfileobj(upload_file.file, buffer)
+        # 1 MiB buffer: multi-MB PDFs/scans copy in a handful of syscalls
+        # instead of many 16 KiB chunks.
+        shutil.copyfileobj(upload_file.file, buffer, length=1024 * 1024)
 
     return dest_path